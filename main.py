@@ -1,14 +1,17 @@
 import asyncio
+import functools
+import logging
 import os
 
-import boto3
-from pyhocon import ConfigFactory
+from pyhocon import ConfigFactory, ConfigTree
 
+from src.clients import close_async_clients, get_client
 from src.definitions import CONFIG_PATH
 from src.hello_world import run_hello_world_demo
+from src.resource_index import ACTIVITIES, ResourceIndex
 from src.step_functions import (
     create_step_function, delete_step_function,
-    get_step_function_adl, list_step_functions,
+    get_step_function_adl, print_step_functions,
     update_step_function
 )
 from src.event_bridges import (
@@ -21,7 +24,28 @@ from src.activities import (
     list_activities, delete_activity
 )
 
-conf = ConfigFactory.parse_file(os.path.join(CONFIG_PATH, 'config.conf'))
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def get_config() -> ConfigTree:
+    """
+    Parse config.conf on first use and return the cached tree afterwards.
+    """
+    return ConfigFactory.parse_file(os.path.join(CONFIG_PATH, 'config.conf'))
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Send log records to stderr as they are emitted.
+
+    The demo is interactive, so records are not buffered; a MemoryHandler
+    would hold back all INFO output until it filled up or the process exited.
+
+    Args:
+        level: Minimum level to emit; records below it are never formatted
+    """
+    logging.basicConfig(level=level, handlers=[logging.StreamHandler()])
 
 
 async def demo_hello_world(stepfunctions, executor_role_arn):
@@ -35,7 +59,7 @@ async def demo_hello_world(stepfunctions, executor_role_arn):
     activity_name = "demo-hello-world-activity"
     state_machine_name = "demo-hello-world-machine"
 
-    # Create activity
+    # CreateActivity is idempotent, so this also returns an existing activity
     activity_arn = create_activity(stepfunctions, activity_name)
     if not activity_arn:
         return
@@ -64,25 +88,25 @@ def demo_step_functions(stepfunctions, executor_role_arn):
         return
 
     # List all state machines
-    list_step_functions(stepfunctions)
+    print_step_functions(stepfunctions)
 
     # Get the ADL definition
-    print("\nRetrieving initial ADL definition:")
-    get_step_function_adl(stepfunctions, state_machine_arn)
+    logger.info("Retrieving initial ADL definition:")
+    get_step_function_adl(stepfunctions, state_machine_arn, verbose=True)
 
     # Update the state machine
-    print("\nUpdating state machine with new state:")
+    logger.info("Updating state machine with new state:")
     if update_step_function(stepfunctions, state_machine_arn, executor_role_arn):
         # Get the updated ADL definition to verify the update
-        print("\nVerifying update - retrieving updated ADL definition:")
-        get_step_function_adl(stepfunctions, state_machine_arn)
+        logger.info("Verifying update - retrieving updated ADL definition:")
+        get_step_function_adl(stepfunctions, state_machine_arn, verbose=True)
 
         # Delete the state machine
-        print("\nDeleting state machine:")
+        logger.info("Deleting state machine:")
         if delete_step_function(stepfunctions, state_machine_arn):
             # List state machines to verify deletion
-            print("\nVerifying deletion - listing remaining state machines:")
-            list_step_functions(stepfunctions)
+            logger.info("Verifying deletion - listing remaining state machines:")
+            print_step_functions(stepfunctions)
 
 def demo_event_bridges(eventbridge):
     """
@@ -103,31 +127,37 @@ def demo_event_bridges(eventbridge):
     list_event_buses(eventbridge)
 
     # Create event rule
-    rule_arn = create_event_rule(eventbridge, event_rule_name, event_bus_name)
-    if not rule_arn:
-        return
-
-    # List event rules
-    list_event_rules(eventbridge, event_bus_name)
-
-    # Delete event rule
-    print("\nDeleting event rule:")
-    if delete_event_rule(eventbridge, event_rule_name, event_bus_name):
-        print("\nVerifying event rule deletion:")
+    rule_arn = create_event_rule(
+        eventbridge,
+        event_rule_name,
+        event_bus_name,
+        get_config().get('event_target_arn', None),
+        get_config().get('event_target_role_arn', None)
+    )
+    # A failed create leaves no rule behind, but the bus still needs deleting
+    if rule_arn:
+        # List event rules
         list_event_rules(eventbridge, event_bus_name)
 
+        # Delete event rule
+        logger.info("Deleting event rule:")
+        if delete_event_rule(eventbridge, event_rule_name, event_bus_name):
+            logger.info("Verifying event rule deletion:")
+            list_event_rules(eventbridge, event_bus_name)
+
     # Delete event bus
-    print("\nDeleting event bus:")
+    logger.info("Deleting event bus:")
     if delete_event_bus(eventbridge, event_bus_arn):
-        print("\nVerifying event bus deletion:")
+        logger.info("Verifying event bus deletion:")
         list_event_buses(eventbridge)
 
-def demo_activities(stepfunctions):
+def demo_activities(stepfunctions, index):
     """
     Demonstrates Step Functions Activity CRUD operations.
 
     Args:
         stepfunctions: Boto3 Step Functions client
+        index: Shared resource index
     """
     activity_name = "MySampleActivity"
 
@@ -135,44 +165,50 @@ def demo_activities(stepfunctions):
     activity_arn = create_activity(stepfunctions, activity_name)
     if not activity_arn:
         return
+    index.add(ACTIVITIES, activity_name, activity_arn)
 
     # List activities
     list_activities(stepfunctions)
 
     # Describe the newly created activity by name
-    describe_activity(stepfunctions, activity_name)
+    describe_activity(stepfunctions, activity_name, index)
 
     # Delete activity
-    print("\nDeleting activity:")
+    logger.info("Deleting activity:")
     if activity_arn and delete_activity(stepfunctions, activity_arn):
-        print("\nVerifying activity deletion:")
+        index.remove(ACTIVITIES, activity_name)
+        logger.info("Verifying activity deletion:")
         list_activities(stepfunctions)
 
 async def amain() -> None:
-    # Initialize AWS session using the system's default credentials
-    session = boto3.Session()
-    stepfunctions = session.client("stepfunctions")
-    eventbridge = session.client("events")
+    # Shared clients using the system's default credentials
+    stepfunctions = get_client("stepfunctions")
+    eventbridge = get_client("events")
+    index = ResourceIndex(stepfunctions, eventbridge)
 
-    executor_role_arn = conf['executor_role_arn']
+    executor_role_arn = get_config()['executor_role_arn']
 
     # Run Step Functions demo
-    print("\nStarting Step Functions demo:")
+    logger.info("Starting Step Functions demo:")
     demo_step_functions(stepfunctions, executor_role_arn)
 
     # Run EventBridge demo
-    print("\nStarting EventBridge demo:")
+    logger.info("Starting EventBridge demo:")
     demo_event_bridges(eventbridge)
 
     # Run Activities demo
-    print("\nStarting Activities demo:")
-    demo_activities(stepfunctions)
+    logger.info("Starting Activities demo:")
+    demo_activities(stepfunctions, index)
 
     # Run Hello World demo
-    print("\nStarting Hello World demo:")
-    await demo_hello_world(stepfunctions, executor_role_arn)
+    logger.info("Starting Hello World demo:")
+    try:
+        await demo_hello_world(stepfunctions, executor_role_arn)
+    finally:
+        await close_async_clients()
 
 def main() -> None:
+    configure_logging()
     asyncio.run(amain())
 
 if __name__ == "__main__":
@@ -1,7 +1,31 @@
+import functools
+import io
 import json
+import logging
 from typing import Optional, Dict
 from botocore.client import BaseClient
 
+from src.resource_index import ResourceIndex
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=512)
+def _describe_activity_cached(client: BaseClient, activity_arn: str) -> Dict:
+    # Activity metadata never changes once created, so it is safe to keep.
+    # Clients hash by identity, so results are never shared between clients.
+    return client.describe_activity(activityArn=activity_arn)
+
+
+def _find_activity_arn(client: BaseClient, activity_name: str) -> Optional[str]:
+    paginator = client.get_paginator("list_activities")
+    for page in paginator.paginate():
+        for activity in page.get("activities", []):
+            if activity["name"] == activity_name:
+                return activity["activityArn"]
+    return None
+
+
 def create_activity(client: BaseClient, activity_name: str) -> Optional[str]:
     """
     Create a new activity.
@@ -16,38 +40,50 @@ def create_activity(client: BaseClient, activity_name: str) -> Optional[str]:
     try:
         response = client.create_activity(name=activity_name)
         activity_arn = response["activityArn"]
-        print(f"Activity created successfully: {activity_arn}")
+        logger.info("Activity created successfully: %s", activity_arn)
         return activity_arn
     except Exception as e:
-        print(f"Error creating Activity: {e}")
+        logger.error("Error creating Activity: %s", e)
         return None
 
-def describe_activity(client: BaseClient, activity_name: str) -> Optional[str]:
+def describe_activity(
+        client: BaseClient,
+        activity_name: str,
+        index: Optional[ResourceIndex] = None
+) -> Optional[str]:
     """
     Describe an activity by name and return its ARN.
 
     Args:
         client: Boto3 Step Functions client
         activity_name: The name of the activity to describe
+        index: Shared resource index to resolve the name from; without one,
+            the activities are listed to find it
 
     Returns:
         The ARN of the activity if found, None otherwise
     """
     try:
-        # List all activities
-        activities = client.list_activities()
-        for activity in activities.get("activities", []):
-            if activity["name"] == activity_name:
-                # Describe the specific activity by ARN
-                response = client.describe_activity(activityArn=activity["activityArn"])
-                print(f"\nActivity Description for '{activity_name}':")
-                print(json.dumps(response, indent=2))
-                return activity["activityArn"]
+        if index is not None:
+            activity_arn = index.activity_arn(activity_name)
+        else:
+            activity_arn = _find_activity_arn(client, activity_name)
+        if not activity_arn:
+            logger.warning("Activity '%s' not found.", activity_name)
+            return None
 
-        print(f"Activity '{activity_name}' not found.")
-        return None
+        # Describe the specific activity by ARN
+        response = _describe_activity_cached(client, activity_arn)
+        # Pretty-printing the full response is debugging output only
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Activity Description for '%s':\n%s",
+                activity_name,
+                json.dumps(response, indent=2, default=str)
+            )
+        return activity_arn
     except Exception as e:
-        print(f"Error describing Activity: {e}")
+        logger.error("Error describing Activity: %s", e)
         return None
 
 def list_activities(client: BaseClient) -> None:
@@ -57,13 +93,18 @@ def list_activities(client: BaseClient) -> None:
     Args:
         client: Boto3 Step Functions client
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
     try:
-        response = client.list_activities()
-        print("\nInstalled Activities:")
-        for activity in response.get("activities", []):
-            print(f"- Name: {activity['name']}, ARN: {activity['activityArn']}")
+        paginator = client.get_paginator("list_activities")
+        buf = io.StringIO()
+        buf.write("Installed Activities:")
+        for page in paginator.paginate():
+            for activity in page.get("activities", []):
+                buf.write(f"\n- Name: {activity['name']}, ARN: {activity['activityArn']}")
+        logger.info("%s", buf.getvalue())
     except Exception as e:
-        print(f"Error listing Activities: {e}")
+        logger.error("Error listing Activities: %s", e)
 
 def delete_activity(client: BaseClient, activity_arn: str) -> bool:
     """
@@ -78,8 +119,8 @@ def delete_activity(client: BaseClient, activity_arn: str) -> bool:
     """
     try:
         client.delete_activity(activityArn=activity_arn)
-        print(f"Activity deleted successfully: {activity_arn}")
+        logger.info("Activity deleted successfully: %s", activity_arn)
         return True
     except Exception as e:
-        print(f"Error deleting Activity: {e}")
+        logger.error("Error deleting Activity: %s", e)
         return False
@@ -1,11 +1,180 @@
 # cleanup.py
 import asyncio
-from typing import List
-import boto3
+import logging
+from typing import Awaitable, Dict, Iterable, List, Optional, Tuple
 from botocore.client import BaseClient
 
+from src.clients import close_async_clients, get_async_client
+from src.event_bridges import REMOVE_TARGETS_MAX_ATTEMPTS, aiter_event_buses, chunks
 
-def cleanup_resources(
+logger = logging.getLogger(__name__)
+
+# Upper bound on in-flight delete calls per batch, well under the client pool size
+MAX_CONCURRENT_DELETES = 16
+
+
+async def _delete_state_machine(stepfunctions_client: BaseClient, sm: Dict) -> None:
+    await stepfunctions_client.delete_state_machine(
+        stateMachineArn=sm['stateMachineArn']
+    )
+    logger.info("Deleted state machine: %s", sm['name'])
+
+
+async def _delete_activity(stepfunctions_client: BaseClient, activity: Dict) -> None:
+    await stepfunctions_client.delete_activity(
+        activityArn=activity['activityArn']
+    )
+    logger.info("Deleted activity: %s", activity['name'])
+
+
+async def _remove_targets(
+        eventbridge_client: BaseClient,
+        bus_name: str,
+        rule_name: str,
+        target_ids: List[str]
+) -> None:
+    for batch in chunks(target_ids):
+        # Retry only the IDs reported in FailedEntries
+        for _ in range(REMOVE_TARGETS_MAX_ATTEMPTS):
+            response = await eventbridge_client.remove_targets(
+                Rule=rule_name,
+                EventBusName=bus_name,
+                Ids=batch,
+                Force=True
+            )
+            if not response.get('FailedEntryCount'):
+                break
+            batch = [entry['TargetId'] for entry in response['FailedEntries']]
+        else:
+            raise RuntimeError(
+                f"Failed to remove targets {batch} from rule {rule_name}"
+            )
+
+
+async def _delete_rule_and_targets(
+        eventbridge_client: BaseClient,
+        bus_name: str,
+        rule: Dict
+) -> None:
+    # Remove targets first
+    target_ids = []
+    paginator = eventbridge_client.get_paginator('list_targets_by_rule')
+    async for page in paginator.paginate(Rule=rule['Name'], EventBusName=bus_name):
+        target_ids.extend(t['Id'] for t in page['Targets'])
+    if target_ids:
+        await _remove_targets(eventbridge_client, bus_name, rule['Name'], target_ids)
+    # Delete rule once every target is gone
+    await eventbridge_client.delete_rule(
+        Name=rule['Name'],
+        EventBusName=bus_name
+    )
+
+
+async def _list_rules(eventbridge_client: BaseClient, bus_name: str) -> List[Dict]:
+    rules = []
+    paginator = eventbridge_client.get_paginator('list_rules')
+    async for page in paginator.paginate(EventBusName=bus_name):
+        rules.extend(page['Rules'])
+    return rules
+
+
+async def _delete_event_bus(eventbridge_client: BaseClient, bus_name: str) -> None:
+    await eventbridge_client.delete_event_bus(Name=bus_name)
+    logger.info("Deleted event bus: %s", bus_name)
+
+
+async def _gather_limited(
+        coros: Iterable[Awaitable],
+        limit: int = MAX_CONCURRENT_DELETES
+) -> List:
+    # Like gather(return_exceptions=True), so one failure never aborts the
+    # rest of the batch, but with at most `limit` calls in flight
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro: Awaitable):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*[run(coro) for coro in coros], return_exceptions=True)
+
+
+def _report_errors(results: List, message: str) -> None:
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("%s: %s", message, result)
+
+
+async def _cleanup_state_machines(stepfunctions_client: BaseClient, project_prefix: str) -> None:
+    paginator = stepfunctions_client.get_paginator('list_state_machines')
+    async for page in paginator.paginate():
+        results = await _gather_limited(
+            _delete_state_machine(stepfunctions_client, sm)
+            for sm in page['stateMachines']
+            if sm['name'].startswith(project_prefix)
+        )
+        _report_errors(results, "Error deleting state machine")
+
+
+async def _cleanup_activities(stepfunctions_client: BaseClient, project_prefix: str) -> None:
+    paginator = stepfunctions_client.get_paginator('list_activities')
+    async for page in paginator.paginate():
+        results = await _gather_limited(
+            _delete_activity(stepfunctions_client, activity)
+            for activity in page['activities']
+            if activity['name'].startswith(project_prefix)
+        )
+        _report_errors(results, "Error deleting activity")
+
+
+async def _cleanup_event_buses(eventbridge_client: BaseClient, project_prefix: str) -> None:
+    bus_names = [bus['Name'] async for bus in aiter_event_buses(eventbridge_client, project_prefix)]
+    if not bus_names:
+        return
+
+    # List the rules of every bus at once
+    failed_buses = set()
+    rules = []
+    listings = await _gather_limited(_list_rules(eventbridge_client, name) for name in bus_names)
+    for bus_name, listing in zip(bus_names, listings):
+        if isinstance(listing, Exception):
+            logger.error("Error listing rules on bus %s: %s", bus_name, listing)
+            failed_buses.add(bus_name)
+        else:
+            rules.extend((bus_name, rule) for rule in listing)
+
+    # Delete every rule across all buses in a single fan-out
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DELETES)
+
+    async def delete_rule(bus_name: str, rule: Dict) -> Tuple[str, str, Optional[Exception]]:
+        async with semaphore:
+            try:
+                await _delete_rule_and_targets(eventbridge_client, bus_name, rule)
+            except Exception as e:
+                return bus_name, rule['Name'], e
+            return bus_name, rule['Name'], None
+
+    for done, next_result in enumerate(
+            asyncio.as_completed([delete_rule(bus_name, rule) for bus_name, rule in rules]),
+            start=1
+    ):
+        bus_name, rule_name, error = await next_result
+        if error:
+            logger.error("Error deleting rule %s on bus %s: %s", rule_name, bus_name, error)
+            failed_buses.add(bus_name)
+        else:
+            logger.info("Deleted rule %s on bus %s (%s/%s)", rule_name, bus_name, done, len(rules))
+
+    # A bus can only be deleted once all of its rules are gone
+    for bus_name in failed_buses:
+        logger.error("Skipping deletion of event bus %s", bus_name)
+    remaining = [name for name in bus_names if name not in failed_buses]
+    results = await _gather_limited(
+        _delete_event_bus(eventbridge_client, name) for name in remaining
+    )
+    _report_errors(results, "Error deleting event bus")
+
+
+async def cleanup_resources(
         stepfunctions_client: BaseClient,
         eventbridge_client: BaseClient,
         project_prefix: str = "demo-"
@@ -13,70 +182,56 @@ def cleanup_resources(
     """
     Cleanup all resources created by our demo project.
 
+    State machines, activities and event buses share no dependencies, so
+    they are listed and deleted concurrently, as are the deletions within
+    each group.
+
     Args:
-        stepfunctions_client: Boto3 Step Functions client
-        eventbridge_client: Boto3 EventBridge client
+        stepfunctions_client: aioboto3 Step Functions client
+        eventbridge_client: aioboto3 EventBridge client
         project_prefix: Prefix used to identify our demo resources
     """
-    # Cleanup Step Functions and Activities
-    try:
-        # List and delete state machines
-        state_machines = stepfunctions_client.list_state_machines()
-        for sm in state_machines['stateMachines']:
-            if sm['name'].startswith(project_prefix):
-                stepfunctions_client.delete_state_machine(
-                    stateMachineArn=sm['stateMachineArn']
-                )
-                print(f"Deleted state machine: {sm['name']}")
-
-        # List and delete activities
-        activities = stepfunctions_client.list_activities()
-        for activity in activities['activities']:
-            if activity['name'].startswith(project_prefix):
-                stepfunctions_client.delete_activity(
-                    activityArn=activity['activityArn']
-                )
-                print(f"Deleted activity: {activity['name']}")
-    except Exception as e:
-        print(f"Error cleaning up Step Functions resources: {e}")
-
-    # Cleanup EventBridge
-    try:
-        # List and delete rules first
-        buses = eventbridge_client.list_event_buses()
-        for bus in buses['EventBuses']:
-            if bus['Name'].startswith(project_prefix):
-                # Delete all rules associated with the bus
-                rules = eventbridge_client.list_rules(EventBusName=bus['Name'])
-                for rule in rules['Rules']:
-                    # Remove targets first
-                    targets = eventbridge_client.list_targets_by_rule(
-                        Rule=rule['Name'],
-                        EventBusName=bus['Name']
-                    )
-                    if targets['Targets']:
-                        target_ids = [t['Id'] for t in targets['Targets']]
-                        eventbridge_client.remove_targets(
-                            Rule=rule['Name'],
-                            EventBusName=bus['Name'],
-                            Ids=target_ids
-                        )
-                    # Delete rule
-                    eventbridge_client.delete_rule(
-                        Name=rule['Name'],
-                        EventBusName=bus['Name']
-                    )
-                    print(f"Deleted rule: {rule['Name']}")
-
-                # Delete event bus
-                eventbridge_client.delete_event_bus(Name=bus['Name'])
-                print(f"Deleted event bus: {bus['Name']}")
-    except Exception as e:
-        print(f"Error cleaning up EventBridge resources: {e}")
+    state_machines, activities, event_buses = await asyncio.gather(
+        _cleanup_state_machines(stepfunctions_client, project_prefix),
+        _cleanup_activities(stepfunctions_client, project_prefix),
+        _cleanup_event_buses(eventbridge_client, project_prefix),
+        return_exceptions=True
+    )
+    if isinstance(state_machines, Exception):
+        logger.error("Error cleaning up State Machines: %s", state_machines)
+    if isinstance(activities, Exception):
+        logger.error("Error cleaning up Activities: %s", activities)
+    if isinstance(event_buses, Exception):
+        logger.error("Error cleaning up EventBridge resources: %s", event_buses)
 
 
 # cleanup.py
 
+# Polling schedule used while waiting for stopped executions to settle
+STOP_POLL_INITIAL_DELAY = 0.5
+STOP_POLL_MAX_DELAY = 5.0
+STOP_WAIT_TIMEOUT = 30
+
+
+async def poll_until_stopped(stepfunctions_client: BaseClient, execution_arn: str) -> None:
+    """
+    Wait until an execution is no longer RUNNING.
+
+    Args:
+        stepfunctions_client: aioboto3 Step Functions client
+        execution_arn: ARN of the execution to watch
+    """
+    delay = STOP_POLL_INITIAL_DELAY
+    while True:
+        response = await stepfunctions_client.describe_execution(
+            executionArn=execution_arn
+        )
+        if response['status'] != 'RUNNING':
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, STOP_POLL_MAX_DELAY)
+
+
 async def cleanup_executions(
         stepfunctions_client: BaseClient,
         state_machine_arn: str
@@ -85,30 +240,46 @@ async def cleanup_executions(
     Cleanup all executions for a given state machine.
 
     Args:
-        stepfunctions_client: Boto3 Step Functions client
+        stepfunctions_client: aioboto3 Step Functions client
         state_machine_arn: ARN of the state machine
     """
     try:
         # List and stop all running executions
-        response = stepfunctions_client.list_executions(
-            stateMachineArn=state_machine_arn,
-            statusFilter='RUNNING'
-        )
+        execution_arns = []
+        paginator = stepfunctions_client.get_paginator('list_executions')
+        async for page in paginator.paginate(
+                stateMachineArn=state_machine_arn,
+                statusFilter='RUNNING'
+        ):
+            execution_arns.extend(e['executionArn'] for e in page['executions'])
 
-        for execution in response['executions']:
+        # Nothing to stop or wait for
+        if not execution_arns:
+            return
+
+        async def stop(execution_arn: str) -> None:
             try:
-                stepfunctions_client.stop_execution(
-                    executionArn=execution['executionArn']
+                await stepfunctions_client.stop_execution(
+                    executionArn=execution_arn
                 )
-                print(f"Stopped execution: {execution['executionArn']}")
+                logger.info("Stopped execution: %s", execution_arn)
+                await poll_until_stopped(stepfunctions_client, execution_arn)
             except Exception as e:
-                print(f"Error stopping execution {execution['executionArn']}: {e}")
+                logger.error("Error stopping execution %s: %s", execution_arn, e)
 
         # Wait for executions to complete
-        await asyncio.sleep(5)
+        await asyncio.wait_for(
+            asyncio.gather(*[stop(execution_arn) for execution_arn in execution_arns]),
+            timeout=STOP_WAIT_TIMEOUT
+        )
 
+    except asyncio.TimeoutError:
+        logger.error(
+            "Timed out after %ss waiting for executions of %s to stop",
+            STOP_WAIT_TIMEOUT, state_machine_arn
+        )
     except Exception as e:
-        print(f"Error cleaning up executions: {e}")
+        logger.error("Error cleaning up executions of %s: %s", state_machine_arn, e)
 
 
 async def cleanup_all_resources(
@@ -120,15 +291,33 @@ async def cleanup_all_resources(
     Cleanup all resources created by our demo project.
 
     Args:
-        stepfunctions_client: Boto3 Step Functions client
-        eventbridge_client: Boto3 EventBridge client
+        stepfunctions_client: aioboto3 Step Functions client
+        eventbridge_client: aioboto3 EventBridge client
         project_prefix: Prefix used to identify our demo resources
     """
     # First cleanup any running executions
-    state_machines = stepfunctions_client.list_state_machines()
-    for sm in state_machines['stateMachines']:
-        if sm['name'].startswith(project_prefix):
-            await cleanup_executions(stepfunctions_client, sm['stateMachineArn'])
+    paginator = stepfunctions_client.get_paginator('list_state_machines')
+    async for page in paginator.paginate():
+        await asyncio.gather(
+            *[cleanup_executions(stepfunctions_client, sm['stateMachineArn'])
+              for sm in page['stateMachines']
+              if sm['name'].startswith(project_prefix)]
+        )
 
     # Then proceed with regular cleanup
-    cleanup_resources(stepfunctions_client, eventbridge_client, project_prefix)
\ No newline at end of file
+    await cleanup_resources(stepfunctions_client, eventbridge_client, project_prefix)
+
+
+async def run_cleanup(project_prefix: str = "demo-") -> None:
+    """
+    Cleanup all resources created by our demo project using the shared aioboto3 clients.
+
+    Args:
+        project_prefix: Prefix used to identify our demo resources
+    """
+    try:
+        stepfunctions_client = await get_async_client("stepfunctions")
+        eventbridge_client = await get_async_client("events")
+        await cleanup_all_resources(stepfunctions_client, eventbridge_client, project_prefix)
+    finally:
+        await close_async_clients()
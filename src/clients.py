@@ -0,0 +1,105 @@
+# clients.py
+import contextlib
+import functools
+from typing import Dict, Optional, Tuple
+
+import aioboto3
+import boto3
+from botocore.client import BaseClient
+from botocore.config import Config
+
+# Shared by every client so TLS connections are pooled and kept alive, and
+# throttled list calls are absorbed by client-side adaptive rate limiting
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True
+)
+
+# get_activity_task long-polls for up to 60s, so reads must outlast it
+ACTIVITY_CLIENT_CONFIG = CLIENT_CONFIG.merge(Config(read_timeout=70, connect_timeout=10))
+
+_async_stack = contextlib.AsyncExitStack()
+_async_clients: Dict[Tuple[str, Config], BaseClient] = {}
+
+
+@functools.cache
+def get_session() -> boto3.Session:
+    """
+    Return the process-wide boto3 session using the default credentials.
+    """
+    return boto3.Session()
+
+
+@functools.cache
+def _client(service_name: str, region_name: Optional[str], endpoint_url: Optional[str]) -> BaseClient:
+    # Unbounded on purpose: evicting a client would silently create a new
+    # one and split every cache keyed by client identity
+    return get_session().client(
+        service_name,
+        region_name=region_name,
+        endpoint_url=endpoint_url,
+        config=CLIENT_CONFIG
+    )
+
+
+def get_client(
+        service_name: str,
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None
+) -> BaseClient:
+    """
+    Return the shared boto3 client for a service, creating it on first use.
+
+    One client is kept per (service, region, endpoint), so the service model
+    and endpoint rules are only loaded once, however the arguments are
+    passed. Tests that swap endpoints or credentials (e.g. moto) should call
+    _client.cache_clear() between cases.
+
+    Args:
+        service_name: AWS service name, e.g. "stepfunctions" or "events"
+        region_name: Region to use, defaults to the session's region
+        endpoint_url: Endpoint override, e.g. for Step Functions Local
+
+    Returns:
+        The boto3 client for the service
+    """
+    # Always pass positionally so equivalent calls share one cache key
+    return _client(service_name, region_name, endpoint_url)
+
+
+async def get_async_client(service_name: str, config: Config = CLIENT_CONFIG) -> BaseClient:
+    """
+    Return the shared aioboto3 client for a service, opening it on first use.
+
+    Clients are bound to the running event loop and stay open until
+    close_async_clients() is awaited, which must happen before that loop
+    ends. A later event loop then opens fresh clients.
+
+    Args:
+        service_name: AWS service name, e.g. "stepfunctions" or "events"
+        config: Botocore config for the client
+
+    Returns:
+        The aioboto3 client for the service
+    """
+    key = (service_name, config)
+    client = _async_clients.get(key)
+    if client is None:
+        client = await _async_stack.enter_async_context(
+            aioboto3.Session().client(service_name, config=config)
+        )
+        _async_clients[key] = client
+    return client
+
+
+async def close_async_clients() -> None:
+    """
+    Close every aioboto3 client opened by get_async_client().
+    """
+    global _async_stack
+    _async_clients.clear()
+    # Start a fresh stack so clients opened afterwards, e.g. under another
+    # asyncio.run(), are tracked and closed too
+    stack, _async_stack = _async_stack, contextlib.AsyncExitStack()
+    await stack.aclose()
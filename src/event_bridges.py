@@ -1,8 +1,68 @@
+import asyncio
+import io
 import json
-from typing import Optional
-import boto3
+import logging
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from botocore.client import BaseClient
 
+logger = logging.getLogger(__name__)
+
+# EventBridge accepts at most this many target IDs per remove_targets call
+REMOVE_TARGETS_BATCH_SIZE = 100
+REMOVE_TARGETS_MAX_ATTEMPTS = 3
+
+def chunks(xs: List, n: int = REMOVE_TARGETS_BATCH_SIZE) -> Iterator[List]:
+    """
+    Split a list into consecutive slices of at most n items.
+    """
+    for i in range(0, len(xs), n):
+        yield xs[i:i + n]
+
+# list_event_buses has no botocore paginator, so both helpers below follow
+# NextToken by hand. Filtering by NamePrefix server side keeps unrelated
+# buses off the wire.
+
+def iter_event_buses(client: BaseClient, name_prefix: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Iterate over all event buses, following NextToken across pages.
+
+    Args:
+        client: Boto3 EventBridge client
+        name_prefix: Only list buses whose name starts with this prefix
+
+    Yields:
+        Event bus list entries (Name, Arn, ...)
+    """
+    kwargs = {'NamePrefix': name_prefix} if name_prefix else {}
+    while True:
+        response = client.list_event_buses(**kwargs)
+        yield from response['EventBuses']
+        if not response.get('NextToken'):
+            break
+        kwargs['NextToken'] = response['NextToken']
+
+async def aiter_event_buses(client: BaseClient, name_prefix: Optional[str] = None) -> AsyncIterator[Dict]:
+    """
+    Async counterpart of iter_event_buses() for aioboto3 clients.
+
+    Args:
+        client: aioboto3 EventBridge client
+        name_prefix: Only list buses whose name starts with this prefix
+
+    Yields:
+        Event bus list entries (Name, Arn, ...)
+    """
+    kwargs = {'NamePrefix': name_prefix} if name_prefix else {}
+    while True:
+        response = await client.list_event_buses(**kwargs)
+        for bus in response['EventBuses']:
+            yield bus
+        if not response.get('NextToken'):
+            break
+        kwargs['NextToken'] = response['NextToken']
+
 def create_event_bus(client: BaseClient, event_bus_name: str) -> Optional[str]:
     """
     Create a new EventBridge event bus.
@@ -17,10 +77,10 @@ def create_event_bus(client: BaseClient, event_bus_name: str) -> Optional[str]:
     try:
         response = client.create_event_bus(Name=event_bus_name)
         event_bus_arn = response['EventBusArn']
-        print(f"Event Bus created successfully: {event_bus_arn}")
+        logger.info("Event Bus created successfully: %s", event_bus_arn)
         return event_bus_arn
     except Exception as e:
-        print(f"Error creating Event Bus: {e}")
+        logger.error("Error creating Event Bus: %s", e)
         return None
 
 def list_event_buses(client: BaseClient) -> None:
@@ -30,25 +90,36 @@ def list_event_buses(client: BaseClient) -> None:
     Args:
         client: Boto3 EventBridge client
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
     try:
-        event_buses = client.list_event_buses()
-        print("\nInstalled Event Buses:")
-        for bus in event_buses['EventBuses']:
-            print(f"- Name: {bus['Name']}, ARN: {bus['Arn']}")
+        buf = io.StringIO()
+        buf.write("Installed Event Buses:")
+        for bus in iter_event_buses(client):
+            buf.write(f"\n- Name: {bus['Name']}, ARN: {bus['Arn']}")
+        logger.info("%s", buf.getvalue())
     except Exception as e:
-        print(f"Error listing Event Buses: {e}")
+        logger.error("Error listing Event Buses: %s", e)
 
-def create_event_rule(client: BaseClient, rule_name: str, event_bus_name: str) -> Optional[str]:
+def create_event_rule(
+        client: BaseClient,
+        rule_name: str,
+        event_bus_name: str,
+        target_arn: Optional[str] = None,
+        target_role_arn: Optional[str] = None
+) -> Optional[str]:
     """
-    Create a new EventBridge event rule.
+    Create a new EventBridge event rule, attaching a target if one is given.
 
     Args:
         client: Boto3 EventBridge client
         rule_name: Name of the event rule to create
         event_bus_name: Name of the event bus to associate the rule with
+        target_arn: ARN of the target to attach to the rule, if any
+        target_role_arn: ARN of the role EventBridge assumes to invoke the target, if required
 
     Returns:
-        The ARN of the created event rule if successful, None otherwise
+        The ARN of the created event rule if it and its target were created, None otherwise
     """
     try:
         response = client.put_rule(
@@ -60,10 +131,25 @@ def create_event_rule(client: BaseClient, rule_name: str, event_bus_name: str) -
             })
         )
         rule_arn = response['RuleArn']
-        print(f"Event Rule created successfully: {rule_arn}")
+        if target_arn:
+            target = {'Id': f"{rule_name}-t1", 'Arn': target_arn}
+            if target_role_arn:
+                target['RoleArn'] = target_role_arn
+            # put_targets is idempotent per target Id
+            response = client.put_targets(
+                Rule=rule_name,
+                EventBusName=event_bus_name,
+                Targets=[target]
+            )
+            if response.get('FailedEntryCount'):
+                logger.error("Error attaching target to Event Rule: %s", response['FailedEntries'])
+                # Don't leave a rule without its target behind
+                client.delete_rule(Name=rule_name, EventBusName=event_bus_name)
+                return None
+        logger.info("Event Rule created successfully: %s", rule_arn)
         return rule_arn
     except Exception as e:
-        print(f"Error creating Event Rule: {e}")
+        logger.error("Error creating Event Rule: %s", e)
         return None
 
 def list_event_rules(client: BaseClient, event_bus_name: str) -> None:
@@ -74,13 +160,18 @@ def list_event_rules(client: BaseClient, event_bus_name: str) -> None:
         client: Boto3 EventBridge client
         event_bus_name: Name of the event bus to list rules for
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
     try:
-        rules = client.list_rules(EventBusName=event_bus_name)
-        print("\nInstalled Event Rules:")
-        for rule in rules['Rules']:
-            print(f"- Name: {rule['Name']}, ARN: {rule['Arn']}")
+        paginator = client.get_paginator('list_rules')
+        buf = io.StringIO()
+        buf.write("Installed Event Rules:")
+        for page in paginator.paginate(EventBusName=event_bus_name):
+            for rule in page['Rules']:
+                buf.write(f"\n- Name: {rule['Name']}, ARN: {rule['Arn']}")
+        logger.info("%s", buf.getvalue())
     except Exception as e:
-        print(f"Error listing Event Rules: {e}")
+        logger.error("Error listing Event Rules: %s", e)
 
 def delete_event_bus(client: BaseClient, event_bus_arn: str) -> bool:
     """
@@ -95,10 +186,10 @@ def delete_event_bus(client: BaseClient, event_bus_arn: str) -> bool:
     """
     try:
         client.delete_event_bus(EventBusName=event_bus_arn)
-        print(f"Event Bus deleted successfully: {event_bus_arn}")
+        logger.info("Event Bus deleted successfully: %s", event_bus_arn)
         return True
     except Exception as e:
-        print(f"Error deleting Event Bus: {e}")
+        logger.error("Error deleting Event Bus: %s", e)
         return False
 
 def delete_event_rule(client: BaseClient, rule_name: str, event_bus_name: str) -> bool:
@@ -114,17 +205,167 @@ def delete_event_rule(client: BaseClient, rule_name: str, event_bus_name: str) -
         bool indicating success or failure
     """
     try:
-        client.remove_targets(
-            Rule=rule_name,
-            EventBusName=event_bus_name,
-            Ids=["target-id"]  # replace with your actual target ID
-        )
+        # A rule can only be deleted once its targets are removed
+        target_ids = []
+        paginator = client.get_paginator('list_targets_by_rule')
+        for page in paginator.paginate(Rule=rule_name, EventBusName=event_bus_name):
+            target_ids.extend(t['Id'] for t in page['Targets'])
+        for batch in chunks(target_ids):
+            # Retry only the IDs reported in FailedEntries
+            for _ in range(REMOVE_TARGETS_MAX_ATTEMPTS):
+                response = client.remove_targets(
+                    Rule=rule_name,
+                    EventBusName=event_bus_name,
+                    Ids=batch
+                )
+                if not response.get('FailedEntryCount'):
+                    break
+                batch = [entry['TargetId'] for entry in response['FailedEntries']]
+            else:
+                # The rule cannot be deleted while any target remains
+                logger.error("Error removing targets %s from Event Rule: %s", batch, rule_name)
+                return False
         client.delete_rule(
             Name=rule_name,
             EventBusName=event_bus_name
         )
-        print(f"Event Rule deleted successfully: {rule_name}")
+        logger.info("Event Rule deleted successfully: %s", rule_name)
         return True
     except Exception as e:
-        print(f"Error deleting Event Rule: {e}")
+        logger.error("Error deleting Event Rule: %s", e)
         return False
+
+class EventBatcher:
+    """
+    Buffer EventBridge PutEvents entries and send them in batches.
+
+    PutEvents accepts up to 10 entries per call. When running inside an
+    event loop, buffered entries are sent from a worker thread, so the
+    blocking put_events call never stalls the loop: right away once a full
+    batch is buffered, otherwise after flush_interval seconds. Entries
+    EventBridge rejects are retried on the next flush, up to max_attempts
+    sends in total. Outside an event loop, full batches are sent inline and
+    flush() must be called for the rest.
+
+    Call close() (or await aclose() inside an event loop) on shutdown to
+    send whatever is still buffered.
+    """
+
+    def __init__(
+            self,
+            client: BaseClient,
+            max_batch: int = 10,
+            flush_interval: float = 0.2,
+            max_attempts: int = 3
+    ):
+        """
+        Args:
+            client: Boto3 EventBridge client
+            max_batch: Maximum number of entries per put_events call
+            flush_interval: Seconds to wait before flushing a partial batch
+                or retrying failed entries
+            max_attempts: Number of sends after which a failing entry is dropped
+        """
+        self._client = client
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self._max_attempts = max_attempts
+        # (entry, number of failed sends so far)
+        self._buffer: List[Tuple[Dict, int]] = []
+        self._lock = threading.Lock()
+        self._full = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def put(self, entry: Dict) -> None:
+        """
+        Queue a single PutEvents entry.
+
+        Args:
+            entry: PutEventsRequestEntry, e.g. {"Source": ..., "DetailType": ..., "Detail": ...}
+        """
+        with self._lock:
+            self._buffer.append((entry, 0))
+            full = len(self._buffer) >= self._max_batch
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if full:
+                self.flush()
+            return
+        if full:
+            self._full.set()
+        self._schedule_flush()
+
+    def flush(self) -> int:
+        """
+        Send every buffered entry, blocking until done. Rejected entries are
+        re-queued for the next flush until they reach max_attempts.
+
+        Returns:
+            The number of entries that failed and were re-queued
+        """
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+        failed = []
+        for i in range(0, len(pending), self._max_batch):
+            batch = pending[i:i + self._max_batch]
+            try:
+                response = self._client.put_events(Entries=[entry for entry, _ in batch])
+            except Exception as e:
+                logger.error("Error putting events: %s", e)
+                failed.extend(pending[i:])
+                break
+            if response.get('FailedEntryCount'):
+                # Result entries are returned in the same order as the request
+                failed.extend(
+                    item for item, result in zip(batch, response['Entries'])
+                    if result.get('ErrorCode')
+                )
+
+        retry = [(entry, attempts + 1) for entry, attempts in failed if attempts + 1 < self._max_attempts]
+        if len(retry) < len(failed):
+            logger.error("Dropped %s events after %s attempts", len(failed) - len(retry), self._max_attempts)
+        if retry:
+            logger.error("Re-queued %s failed events", len(retry))
+            with self._lock:
+                self._buffer[:0] = retry
+        return len(retry)
+
+    def close(self) -> None:
+        """
+        Send everything still buffered, retrying failed entries until they
+        are sent or dropped. Blocks, so use aclose() inside an event loop.
+        """
+        self._closed = True
+        while self.flush():
+            time.sleep(self._flush_interval)
+
+    async def aclose(self) -> None:
+        """
+        Wait for any scheduled flush, then send everything still buffered
+        from a worker thread.
+        """
+        self._closed = True
+        task = self._flush_task
+        if task is not None:
+            # Wake a flush that is still waiting out its interval
+            self._full.set()
+            await task
+        await asyncio.to_thread(self.close)
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None and not self._closed:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.wait_for(self._full.wait(), self._flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._full.clear()
+        await asyncio.to_thread(self.flush)
+        self._flush_task = None
+        # Pick up re-queued entries and anything put while sending
+        if self._buffer:
+            self._schedule_flush()
@@ -1,10 +1,35 @@
 # hello_world.py
 import asyncio
 import json
-from typing import Optional, Dict
-import boto3
+import logging
+from typing import Optional
 from botocore.client import BaseClient
 
+from src.clients import ACTIVITY_CLIENT_CONFIG, get_async_client
+
+logger = logging.getLogger(__name__)
+
+# Number of concurrent get_activity_task long-pollers
+WORKER_COUNT = 4
+
+# Backoff schedule for describe_execution polling
+EXECUTION_POLL_INITIAL_DELAY = 0.5
+EXECUTION_POLL_MAX_DELAY = 8
+
+# Serialized once at import; only the activity ARN varies per state machine
+_ACTIVITY_ARN_PLACEHOLDER = "__ARN__"
+_ASL_TEMPLATE = json.dumps({
+    "Comment": "A hello world example using an activity",
+    "StartAt": "HelloWorldActivity",
+    "States": {
+        "HelloWorldActivity": {
+            "Type": "Task",
+            "Resource": _ACTIVITY_ARN_PLACEHOLDER,
+            "End": True
+        }
+    }
+})
+
 
 def create_hello_world_stepfunction(
         client: BaseClient,
@@ -24,30 +49,20 @@ def create_hello_world_stepfunction(
     Returns:
         The ARN of the created state machine if successful, None otherwise
     """
-    asl_definition = {
-        "Comment": "A hello world example using an activity",
-        "StartAt": "HelloWorldActivity",
-        "States": {
-            "HelloWorldActivity": {
-                "Type": "Task",
-                "Resource": activity_arn,
-                "End": True
-            }
-        }
-    }
+    asl_definition = _ASL_TEMPLATE.replace(_ACTIVITY_ARN_PLACEHOLDER, activity_arn)
 
     try:
         response = client.create_state_machine(
             name=state_machine_name,
-            definition=json.dumps(asl_definition),
+            definition=asl_definition,
             roleArn=executor_role_arn,
             type="STANDARD"
         )
         state_machine_arn = response['stateMachineArn']
-        print(f"Hello World State Machine created: {state_machine_arn}")
+        logger.info("Hello World State Machine created: %s", state_machine_arn)
         return state_machine_arn
     except Exception as e:
-        print(f"Error creating Hello World State Machine: {e}")
+        logger.error("Error creating Hello World State Machine: %s", e)
         return None
 
 
@@ -55,34 +70,30 @@ async def activity_worker(client: BaseClient, activity_arn: str) -> None:
     """
     Worker that listens for activity tasks and executes them.
 
+    get_activity_task long-polls server side, so no client-side delay is
+    needed between polls.
+
     Args:
-        client: Boto3 Step Functions client
+        client: aioboto3 Step Functions client
         activity_arn: ARN of the activity to poll
     """
     while True:
         try:
             # Get activity task
-            response = await asyncio.to_thread(
-                client.get_activity_task,
-                activityArn=activity_arn
-            )
+            response = await client.get_activity_task(activityArn=activity_arn)
 
-            if 'taskToken' in response:
-                print("Executing Hello World activity...")
+            if response.get('taskToken'):
+                logger.debug("Executing Hello World activity...")
 
                 # Send task success
-                await asyncio.to_thread(
-                    client.send_task_success,
+                await client.send_task_success(
                     taskToken=response['taskToken'],
                     output=json.dumps({"message": "Hello World!"})
                 )
-                print("Activity executed successfully")
-
-            # Small delay to prevent tight polling
-            await asyncio.sleep(1)
+                logger.debug("Activity executed successfully")
 
         except Exception as e:
-            print(f"Error in activity worker: {e}")
+            logger.error("Error in activity worker: %s", e)
             await asyncio.sleep(5)  # Longer delay on error
 
 
@@ -105,10 +116,10 @@ def start_hello_world_execution(client: BaseClient, state_machine_arn: str) -> O
             input=json.dumps({"data": "Hello World!"})
         )
         execution_arn = response['executionArn']
-        print(f"Started execution: {execution_arn}")
+        logger.info("Started execution: %s", execution_arn)
         return execution_arn
     except Exception as e:
-        print(f"Error starting execution: {e}")
+        logger.error("Error starting execution: %s", e)
         return None
 
 
@@ -137,23 +148,29 @@ async def run_hello_world_demo(
     if not state_machine_arn:
         return
 
+    workers = []
     try:
-        # Start the activity worker
-        worker_task = asyncio.create_task(activity_worker(client, activity_arn))
+        # Start the activity workers
+        worker_client = await get_async_client("stepfunctions", ACTIVITY_CLIENT_CONFIG)
+        workers = [
+            asyncio.create_task(activity_worker(worker_client, activity_arn))
+            for _ in range(WORKER_COUNT)
+        ]
 
         # Start the execution
         execution_arn = start_hello_world_execution(client, state_machine_arn)
         if not execution_arn:
-            worker_task.cancel()
             return
 
         # Wait for execution to complete (with timeout)
         timeout = 60  # seconds
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
 
+        backoff = EXECUTION_POLL_INITIAL_DELAY
         while True:
-            if asyncio.get_event_loop().time() - start_time > timeout:
-                print("Execution timed out")
+            if loop.time() - start_time > timeout:
+                logger.warning("Execution timed out")
                 break
 
             response = await asyncio.to_thread(
@@ -162,20 +179,19 @@ async def run_hello_world_demo(
             )
 
             if response['status'] in ['SUCCEEDED', 'FAILED', 'TIMED_OUT', 'ABORTED']:
-                print(f"Execution completed with status: {response['status']}")
+                logger.info("Execution completed with status: %s", response['status'])
                 if 'output' in response:
-                    print(f"Execution output: {response['output']}")
+                    logger.info("Execution output: %s", response['output'])
                 break
 
-            await asyncio.sleep(2)
+            # Short executions finish quickly, so start polling fast and back off
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 1.5, EXECUTION_POLL_MAX_DELAY)
 
     except Exception as e:
-        print(f"Error in hello world demo: {e}")
+        logger.error("Error in hello world demo: %s", e)
     finally:
         # Cleanup
-        if worker_task:
+        for worker_task in workers:
             worker_task.cancel()
-            try:
-                await worker_task
-            except asyncio.CancelledError:
-                pass
\ No newline at end of file
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,141 @@
+# resource_index.py
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from botocore.client import BaseClient
+
+from src.event_bridges import iter_event_buses
+
+# Resource types held by the index
+STATE_MACHINES = 'state_machines'
+ACTIVITIES = 'activities'
+EVENT_BUSES = 'event_buses'
+
+
+class ResourceIndex:
+    """
+    In-memory name -> ARN index of state machines, activities and event buses.
+
+    Each resource type is populated lazily from one paginated listing the
+    first time it is looked up, and reused until that listing is older than
+    the TTL, so repeated lookups during a run do not rescan the whole account
+    and a lookup of one type never lists the others.
+    """
+
+    def __init__(self, stepfunctions_client: BaseClient, eventbridge_client: BaseClient):
+        """
+        Args:
+            stepfunctions_client: Boto3 Step Functions client
+            eventbridge_client: Boto3 EventBridge client
+        """
+        self._sf = stepfunctions_client
+        self._eb = eventbridge_client
+        self._loaders: Dict[str, Callable[[], Dict[str, str]]] = {
+            STATE_MACHINES: self._list_state_machines,
+            ACTIVITIES: self._list_activities,
+            EVENT_BUSES: self._list_event_buses,
+        }
+        self._arns: Dict[str, Dict[str, str]] = {kind: {} for kind in self._loaders}
+        self._ts: Dict[str, float] = {kind: 0.0 for kind in self._loaders}
+        # Resources created by this process that listings have not shown yet
+        self._added: Dict[str, Dict[str, str]] = {kind: {} for kind in self._loaders}
+        self._lock = threading.Lock()
+
+    def _list_state_machines(self) -> Dict[str, str]:
+        arns = {}
+        for page in self._sf.get_paginator('list_state_machines').paginate():
+            for sm in page['stateMachines']:
+                arns[sm['name']] = sm['stateMachineArn']
+        return arns
+
+    def _list_activities(self) -> Dict[str, str]:
+        arns = {}
+        for page in self._sf.get_paginator('list_activities').paginate():
+            for activity in page['activities']:
+                arns[activity['name']] = activity['activityArn']
+        return arns
+
+    def _list_event_buses(self) -> Dict[str, str]:
+        return {bus['Name']: bus['Arn'] for bus in iter_event_buses(self._eb)}
+
+    def refresh(self, kind: str, ttl: float = 30) -> None:
+        """
+        Re-populate one resource type if its listing is older than the TTL.
+
+        Args:
+            kind: One of STATE_MACHINES, ACTIVITIES or EVENT_BUSES
+            ttl: Maximum age in seconds before the listing is rebuilt
+        """
+        with self._lock:
+            if self._ts[kind] and time.monotonic() - self._ts[kind] < ttl:
+                return
+            arns = self._loaders[kind]()
+            # Listings are eventually consistent, so keep recent creates
+            # until a listing includes them
+            added = self._added[kind]
+            for name in [name for name in added if name in arns]:
+                del added[name]
+            arns.update(added)
+            self._arns[kind] = arns
+            self._ts[kind] = time.monotonic()
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """
+        Force the next lookup of a resource type, or of every type, to list it again.
+
+        Args:
+            kind: Resource type to invalidate, or None for all of them
+        """
+        with self._lock:
+            for k in [kind] if kind else self._ts:
+                self._ts[k] = 0.0
+
+    def add(self, kind: str, name: str, arn: str) -> None:
+        """
+        Record a resource this process just created, without re-listing.
+
+        The entry is kept across refreshes until a listing includes it.
+
+        Args:
+            kind: One of STATE_MACHINES, ACTIVITIES or EVENT_BUSES
+            name: Name of the resource
+            arn: ARN of the resource
+        """
+        with self._lock:
+            self._added[kind][name] = arn
+            self._arns[kind][name] = arn
+
+    def remove(self, kind: str, name: str) -> None:
+        """
+        Forget a resource this process just deleted, without re-listing.
+
+        Args:
+            kind: One of STATE_MACHINES, ACTIVITIES or EVENT_BUSES
+            name: Name of the resource
+        """
+        with self._lock:
+            self._added[kind].pop(name, None)
+            self._arns[kind].pop(name, None)
+
+    def _lookup(self, kind: str, name: str) -> Optional[str]:
+        self.refresh(kind)
+        return self._arns[kind].get(name)
+
+    def sm_arn(self, name: str) -> Optional[str]:
+        """
+        Return the ARN of the state machine with the given name, if any.
+        """
+        return self._lookup(STATE_MACHINES, name)
+
+    def activity_arn(self, name: str) -> Optional[str]:
+        """
+        Return the ARN of the activity with the given name, if any.
+        """
+        return self._lookup(ACTIVITIES, name)
+
+    def bus_arn(self, name: str) -> Optional[str]:
+        """
+        Return the ARN of the event bus with the given name, if any.
+        """
+        return self._lookup(EVENT_BUSES, name)
@@ -1,32 +1,284 @@
 # step_functions.py
+import hashlib
+import io
 import json
-from typing import Dict, List, Optional
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 from botocore.client import BaseClient
+from botocore.exceptions import BotoCoreError, ClientError
 
+from src import clients
 
-def get_step_function_adl(client: BaseClient, state_machine_arn: str) -> Optional[Dict]:
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# How long a fetched definition is reused before describing the machine again
+DEFINITION_CACHE_TTL_SECONDS = 60
+
+# Tag holding a hash of the definition and role a state machine was last written with
+DEFINITION_HASH_TAG = 'defHash'
+
+# client -> (arn -> (fetched at, raw definition, parsed definition or None)).
+# Like _name_index below, this is kept per client: clients for different
+# endpoints can see the same ARN, e.g. Step Functions Local's fixed account.
+_definition_cache: "weakref.WeakKeyDictionary[BaseClient, Dict[str, Tuple[float, str, Optional[Dict]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# client -> (state machine name -> ARN), filled by creates and
+# refresh_name_index(). Clients for different regions or endpoints see
+# different machines, so each has its own index.
+_name_index: "weakref.WeakKeyDictionary[BaseClient, Dict[str, str]]" = weakref.WeakKeyDictionary()
+_name_index_lock = threading.Lock()
+
+# Error codes meaning a state machine ARN no longer exists
+_MISSING_ERROR_CODES = ('StateMachineDoesNotExist', 'ResourceNotFound')
+
+# client -> (arn -> hash of the definition and role this process last wrote
+# or saw for it), per client for the same reason as _definition_cache
+_last_deployment_hash: "weakref.WeakKeyDictionary[BaseClient, Dict[str, str]]" = weakref.WeakKeyDictionary()
+_per_client_lock = threading.Lock()
+
+# Exception classes are generated per client, so cache them per client
+# without keeping closed clients alive
+_exception_cache: "weakref.WeakKeyDictionary[BaseClient, Dict[str, type]]" = weakref.WeakKeyDictionary()
+
+
+def get_client(region_name: Optional[str] = None, endpoint_url: Optional[str] = None) -> BaseClient:
+    """
+    Return the shared Step Functions client for a region and endpoint.
+
+    Every function here takes its client explicitly; pass this one rather
+    than building a new client per call. See src.clients.get_client.
+
+    Args:
+        region_name: Region to use, defaults to the session's region
+        endpoint_url: Endpoint override, e.g. for Step Functions Local
+
+    Returns:
+        Boto3 step functions client
+    """
+    return clients.get_client("stepfunctions", region_name, endpoint_url)
+
+
+class SMResult(NamedTuple):
+    """
+    Outcome of a state machine read, carrying the definition in both forms
+    so callers never have to re-fetch or re-parse it.
+
+    Truthy only when the read succeeded, so `if not result:` catches failures.
+    """
+    arn: Optional[str]
+    raw: Optional[str]
+    parsed: Optional[Dict]
+    ok: bool
+    error: Optional[str]
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def definition(self, client: BaseClient) -> Optional[Dict]:
+        """
+        Return the parsed definition, parsing it on first use if it was read
+        with parse=False. The parsed form is kept in the definition cache, so
+        later calls and reads reuse it.
+
+        Args:
+            client: Boto3 step functions client the definition was read with
+        """
+        if self.parsed is not None or not self.ok:
+            return self.parsed
+        return _fetch_definition(self.arn, client, parse=True)[1]
+
+
+def _client_exception(client: BaseClient, name: str) -> type:
+    """
+    Return a modeled exception class of a client, resolving it only once.
+    """
+    exceptions = _exception_cache.get(client)
+    if exceptions is None:
+        exceptions = _exception_cache.setdefault(client, {})
+    exc = exceptions.get(name)
+    if exc is None:
+        exc = exceptions[name] = getattr(client.exceptions, name)
+    return exc
+
+
+def _per_client(cache: weakref.WeakKeyDictionary, client: BaseClient) -> Dict:
+    # Operations on the returned dict are atomic, so only creating a
+    # client's entry needs the lock
+    with _per_client_lock:
+        return cache.setdefault(client, {})
+
+
+def _indexed_arn(client: BaseClient, name: str) -> Optional[str]:
+    with _name_index_lock:
+        return _name_index.get(client, {}).get(name)
+
+
+def _index_arn(client: BaseClient, name: str, arn: str) -> None:
+    with _name_index_lock:
+        _name_index.setdefault(client, {})[name] = arn
+
+
+def _unindex_arn(client: BaseClient, arn: str) -> None:
+    # The name is the last segment of a state machine ARN
+    name = arn.rsplit(':', 1)[-1]
+    with _name_index_lock:
+        names = _name_index.get(client)
+        if names and names.get(name) == arn:
+            del names[name]
+
+
+def _unindex_if_missing(client: BaseClient, arn: str, error: Exception) -> None:
+    # Drop an ARN the index still holds once a call reports it deleted
+    if not isinstance(error, ClientError):
+        return
+    if error.response.get('Error', {}).get('Code') in _MISSING_ERROR_CODES:
+        _unindex_arn(client, arn)
+
+
+def _hash_tags(deployment_hash: str) -> List[Dict[str, str]]:
+    return [{'key': DEFINITION_HASH_TAG, 'value': deployment_hash}]
+
+
+def _dumps(obj: Dict) -> str:
+    # boto3 expects the definition as str, orjson produces bytes
+    return orjson.dumps(obj).decode() if orjson else json.dumps(obj)
+
+
+def _loads(definition: Union[str, bytes]) -> Dict:
+    # Both parsers take str or UTF-8 bytes directly. describe_state_machine
+    # already hands back a str, and orjson reads a str's UTF-8 buffer without
+    # copying it, so it is parsed as-is rather than re-encoded to bytes first.
+    return orjson.loads(definition) if orjson else json.loads(definition)
+
+
+def _deployment_hash(definition: str, role_arn: str) -> str:
+    # The role is part of the key, so a role change alone is never skipped
+    digest = hashlib.blake2b(definition.encode(), digest_size=16)
+    digest.update(b'\0' + role_arn.encode())
+    return digest.hexdigest()
+
+
+# The demo definitions never change, so serialize them once at import
+_HELLO_WORLD_ASL = _dumps({
+    "Comment": "A simple Hello World example",
+    "StartAt": "HelloWorld",
+    "States": {
+        "HelloWorld": {
+            "Type": "Pass",
+            "Result": "Hello, World!",
+            "End": True
+        }
+    }
+})
+
+_HELLO_GOODBYE_ASL = _dumps({
+    "Comment": "An updated Hello World example",
+    "StartAt": "HelloWorld",
+    "States": {
+        "HelloWorld": {
+            "Type": "Pass",
+            "Result": "Hello, World!",
+            "Next": "GoodbyeWorld"
+        },
+        "GoodbyeWorld": {
+            "Type": "Pass",
+            "Result": "Goodbye, World!",
+            "End": True
+        }
+    }
+})
+
+
+def _fetch_definition(
+        state_machine_arn: str,
+        client: BaseClient,
+        parse: bool = True
+) -> Tuple[str, Optional[Dict]]:
+    """
+    Return the raw and, if requested, parsed definition for a state machine,
+    from cache when fresh.
+
+    The raw string is cached as fetched and only parsed, once, the first
+    time a caller asks for the parsed form.
+    """
+    definitions = _per_client(_definition_cache, client)
+    cached = definitions.get(state_machine_arn)
+    if cached and time.monotonic() - cached[0] < DEFINITION_CACHE_TTL_SECONDS:
+        fetched_at, raw, parsed = cached
+    else:
+        response = client.describe_state_machine(
+            stateMachineArn=state_machine_arn
+        )
+        fetched_at, raw, parsed = time.monotonic(), response['definition'], None
+
+    if parse and parsed is None:
+        parsed = _loads(raw)
+    # Store whatever was refetched or newly parsed, so an expired entry is
+    # replaced even when nothing gets parsed
+    if cached is None or fetched_at != cached[0] or cached[2] is not parsed:
+        definitions[state_machine_arn] = (fetched_at, raw, parsed)
+    return raw, parsed
+
+
+def invalidate_definition(client: BaseClient, state_machine_arn: str) -> None:
+    """
+    Drop the cached definition for a state machine after it changes.
+
+    Args:
+        client: Boto3 step functions client the definition was read with
+        state_machine_arn: ARN of the state machine
+    """
+    _per_client(_definition_cache, client).pop(state_machine_arn, None)
+
+
+def get_step_function_adl(
+        client: BaseClient,
+        state_machine_arn: str,
+        verbose: bool = False,
+        parse: bool = True
+) -> SMResult:
     """
     Retrieve the Amazon States Language (ASL/ADL) definition for a step function.
 
+    Definitions are cached per client and ARN for DEFINITION_CACHE_TTL_SECONDS.
+
     Args:
         client: Boto3 step functions client
         state_machine_arn: ARN of the state machine to retrieve
+        verbose: Log the pretty-printed definition at INFO level
+        parse: Populate the parsed definition; pass False to skip parsing when
+            only the raw JSON string is needed, e.g. for existence checks
 
     Returns:
-        Dict containing the ASL definition if successful, None otherwise
+        SMResult with ok=True and the raw (and parsed, if requested) definition
+        if successful, otherwise ok=False and the error message
     """
     try:
-        response = client.describe_state_machine(
-            stateMachineArn=state_machine_arn
-        )
-        definition = json.loads(response['definition'])
-        print(f"Retrieved ASL definition for {state_machine_arn}:")
-        print(json.dumps(definition, indent=2))
-        return definition
-    except Exception as e:
-        print(f"Error retrieving state machine definition: {e}")
-        return None
+        raw, parsed = _fetch_definition(state_machine_arn, client, parse)
+        # Check the level first so the indent=2 re-serialization is skipped too
+        if verbose and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Retrieved ASL definition for %s:\n%s",
+                state_machine_arn,
+                json.dumps(parsed, indent=2) if parse else raw
+            )
+        return SMResult(state_machine_arn, raw, parsed, True, None)
+    except (ClientError, BotoCoreError) as e:
+        _unindex_if_missing(client, state_machine_arn, e)
+        logger.exception("Error retrieving state machine definition")
+        return SMResult(state_machine_arn, None, None, False, str(e))
 
 
 def update_step_function(client: BaseClient, state_machine_arn: str, executor_role_arn: str) -> bool:
@@ -41,40 +293,44 @@ def update_step_function(client: BaseClient, state_machine_arn: str, executor_ro
     Returns:
         bool indicating success or failure
     """
+    does_not_exist = _client_exception(client, 'StateMachineDoesNotExist')
+    deployment_hash = _deployment_hash(_HELLO_GOODBYE_ASL, executor_role_arn)
     try:
-        # First get the current definition
-        current_definition = get_step_function_adl(client, state_machine_arn)
-        if not current_definition:
-            return False
-
-        # Add new state after HelloWorld
-        updated_definition = {
-            "Comment": "An updated Hello World example",
-            "StartAt": "HelloWorld",
-            "States": {
-                "HelloWorld": {
-                    "Type": "Pass",
-                    "Result": "Hello, World!",
-                    "Next": "GoodbyeWorld"
-                },
-                "GoodbyeWorld": {
-                    "Type": "Pass",
-                    "Result": "Goodbye, World!",
-                    "End": True
-                }
-            }
-        }
+        # Hash the deployed definition and role once if this process has not written them
+        deployed = _per_client(_last_deployment_hash, client)
+        last_hash = deployed.get(state_machine_arn)
+        if last_hash is None:
+            # The definition cache holds no role, so describe directly and
+            # keep the definition for later reads
+            response = client.describe_state_machine(stateMachineArn=state_machine_arn)
+            definitions = _per_client(_definition_cache, client)
+            definitions[state_machine_arn] = (time.monotonic(), response['definition'], None)
+            last_hash = _deployment_hash(response['definition'], response['roleArn'])
+            deployed[state_machine_arn] = last_hash
+        if last_hash == deployment_hash:
+            logger.info("State Machine already up to date: %s", state_machine_arn)
+            return True
 
-        # Update the state machine
-        response = client.update_state_machine(
+        # Update the state machine, adding a new state after HelloWorld.
+        # The new definition does not depend on the current one, so there is
+        # no need to parse it; a missing machine is reported by the call.
+        client.update_state_machine(
             stateMachineArn=state_machine_arn,
-            definition=json.dumps(updated_definition),
+            definition=_HELLO_GOODBYE_ASL,
             roleArn=executor_role_arn
         )
-        print(f"State Machine updated successfully: {state_machine_arn}")
+        # Keep the tag in step so ensure_step_function sees this update
+        client.tag_resource(resourceArn=state_machine_arn, tags=_hash_tags(deployment_hash))
+        deployed[state_machine_arn] = deployment_hash
+        invalidate_definition(client, state_machine_arn)
+        logger.info("State Machine updated successfully: %s", state_machine_arn)
         return True
-    except Exception as e:
-        print(f"Error updating State Machine: {e}")
+    except does_not_exist:
+        _unindex_arn(client, state_machine_arn)
+        logger.error("State Machine does not exist: %s", state_machine_arn)
+        return False
+    except (ClientError, BotoCoreError):
+        logger.exception("Error updating State Machine")
         return False
 
 
@@ -82,58 +338,177 @@ def create_step_function(client: BaseClient, state_machine_name: str, executor_r
     """
     Create a new step function with a simple Hello World state.
 
+    Idempotent: if a state machine with this name is already known, or
+    creation reports that it exists, its ARN is returned instead.
+
     Args:
         client: Boto3 step functions client
         state_machine_name: Name for the new state machine
         executor_role_arn: ARN of the role to execute the state machine
 
     Returns:
-        The ARN of the created state machine if successful, None otherwise
-    """
-    asl_definition = {
-        "Comment": "A simple Hello World example",
-        "StartAt": "HelloWorld",
-        "States": {
-            "HelloWorld": {
-                "Type": "Pass",
-                "Result": "Hello, World!",
-                "End": True
-            }
-        }
-    }
+        The ARN of the created or existing state machine if successful, None otherwise
+    """
+    state_machine_arn = _indexed_arn(client, state_machine_name)
+    if state_machine_arn:
+        return state_machine_arn
 
+    deployment_hash = _deployment_hash(_HELLO_WORLD_ASL, executor_role_arn)
+    already_exists = _client_exception(client, 'StateMachineAlreadyExists')
     try:
         response = client.create_state_machine(
             name=state_machine_name,
-            definition=json.dumps(asl_definition),
+            definition=_HELLO_WORLD_ASL,
             roleArn=executor_role_arn,
-            type="STANDARD"
+            type="STANDARD",
+            tags=_hash_tags(deployment_hash)
         )
         state_machine_arn = response['stateMachineArn']
-        print(f"State Machine created successfully: {state_machine_arn}")
+        _per_client(_last_deployment_hash, client)[state_machine_arn] = deployment_hash
+        _index_arn(client, state_machine_name, state_machine_arn)
+        logger.info("State Machine created successfully: %s", state_machine_arn)
         return state_machine_arn
-    except client.exceptions.StateMachineAlreadyExists:
-        print("State Machine already exists.")
+    except already_exists:
+        logger.warning("State Machine already exists.")
+    except (ClientError, BotoCoreError):
+        logger.exception("Error creating State Machine")
         return None
-    except Exception as e:
-        print(f"Error creating State Machine: {e}")
+
+    # Look the existing machine up outside the handler, so a failed listing
+    # is reported like any other error
+    try:
+        refresh_name_index(client)
+    except (ClientError, BotoCoreError):
+        logger.exception("Error listing State Machines")
         return None
+    return _indexed_arn(client, state_machine_name)
+
+
+def list_step_functions(client: BaseClient) -> Iterator[Dict]:
+    """
+    Lazily iterate over all available step functions, one page at a time.
+
+    Args:
+        client: Boto3 step functions client
+
+    Yields:
+        State machine list entries (name, stateMachineArn, type, creationDate)
+    """
+    paginator = client.get_paginator('list_state_machines')
+    for page in paginator.paginate(PaginationConfig={'PageSize': 1000}):
+        yield from page['stateMachines']
+
+
+def refresh_name_index(client: BaseClient) -> None:
+    """
+    Rebuild the state machine name -> ARN index of a client from a full listing.
+
+    Args:
+        client: Boto3 step functions client
+    """
+    index = {sm['name']: sm['stateMachineArn'] for sm in list_step_functions(client)}
+    # Swap the whole index in at once so concurrent lookups never see it empty
+    with _name_index_lock:
+        _name_index[client] = index
 
 
-def list_step_functions(client: BaseClient) -> None:
+def print_step_functions(client: BaseClient) -> None:
     """
-    List all available step functions.
+    Log all available step functions.
 
     Args:
         client: Boto3 step functions client
     """
+    # Listing is only for display, so skip it entirely when nobody would see it
+    if not logger.isEnabledFor(logging.INFO):
+        return
     try:
-        state_machines = client.list_state_machines()
-        print("\nInstalled State Machines:")
-        for sm in state_machines['stateMachines']:
-            print(f"- Name: {sm['name']}, ARN: {sm['stateMachineArn']}")
-    except Exception as e:
-        print(f"Error listing State Machines: {e}")
+        # Emit the whole listing as a single record rather than one per line
+        buf = io.StringIO()
+        buf.write("Installed State Machines:")
+        for sm in list_step_functions(client):
+            buf.write(f"\n- Name: {sm['name']}, ARN: {sm['stateMachineArn']}")
+        logger.info("%s", buf.getvalue())
+    except (ClientError, BotoCoreError):
+        logger.exception("Error listing State Machines")
+
+
+def ensure_step_function(
+        client: BaseClient,
+        state_machine_name: str,
+        executor_role_arn: str,
+        definition: str
+) -> Optional[str]:
+    """
+    Create a step function, or bring an existing one up to date.
+
+    A hash of the definition and role is stored in the DEFINITION_HASH_TAG
+    tag, so an existing state machine is only updated when either changed.
+
+    Args:
+        client: Boto3 step functions client
+        state_machine_name: Name of the state machine
+        executor_role_arn: ARN of the role to execute the state machine
+        definition: Serialized ASL definition
+
+    Returns:
+        The ARN of the state machine if successful, None otherwise
+    """
+    deployment_hash = _deployment_hash(definition, executor_role_arn)
+    tags = _hash_tags(deployment_hash)
+    already_exists = _client_exception(client, 'StateMachineAlreadyExists')
+    try:
+        response = client.create_state_machine(
+            name=state_machine_name,
+            definition=definition,
+            roleArn=executor_role_arn,
+            type="STANDARD",
+            tags=tags
+        )
+        state_machine_arn = response['stateMachineArn']
+        _per_client(_last_deployment_hash, client)[state_machine_arn] = deployment_hash
+        _index_arn(client, state_machine_name, state_machine_arn)
+        logger.info("State Machine created successfully: %s", state_machine_arn)
+        return state_machine_arn
+    except already_exists:
+        pass
+    except (ClientError, BotoCoreError):
+        logger.exception("Error creating State Machine")
+        return None
+
+    try:
+        state_machine_arn = _indexed_arn(client, state_machine_name)
+        if not state_machine_arn:
+            refresh_name_index(client)
+            state_machine_arn = _indexed_arn(client, state_machine_name)
+        if not state_machine_arn:
+            logger.error("State Machine not found: %s", state_machine_name)
+            return None
+
+        response = client.list_tags_for_resource(resourceArn=state_machine_arn)
+        current_hash = next(
+            (tag['value'] for tag in response['tags'] if tag['key'] == DEFINITION_HASH_TAG),
+            None
+        )
+        if current_hash == deployment_hash:
+            logger.info("State Machine already up to date: %s", state_machine_arn)
+            return state_machine_arn
+
+        client.update_state_machine(
+            stateMachineArn=state_machine_arn,
+            definition=definition,
+            roleArn=executor_role_arn
+        )
+        client.tag_resource(resourceArn=state_machine_arn, tags=tags)
+        _per_client(_last_deployment_hash, client)[state_machine_arn] = deployment_hash
+        invalidate_definition(client, state_machine_arn)
+        logger.info("State Machine updated successfully: %s", state_machine_arn)
+        return state_machine_arn
+    except (ClientError, BotoCoreError) as e:
+        if state_machine_arn:
+            _unindex_if_missing(client, state_machine_arn, e)
+        logger.exception("Error updating State Machine")
+        return None
 
 # step_functions.py
 # Add this new function at the bottom of the file
@@ -153,8 +528,80 @@ def delete_step_function(client: BaseClient, state_machine_arn: str) -> bool:
         client.delete_state_machine(
             stateMachineArn=state_machine_arn
         )
-        print(f"State Machine deleted successfully: {state_machine_arn}")
+        _per_client(_last_deployment_hash, client).pop(state_machine_arn, None)
+        invalidate_definition(client, state_machine_arn)
+        _unindex_arn(client, state_machine_arn)
+        logger.info("State Machine deleted successfully: %s", state_machine_arn)
         return True
-    except Exception as e:
-        print(f"Error deleting State Machine: {e}")
-        return False
\ No newline at end of file
+    except (ClientError, BotoCoreError):
+        logger.exception("Error deleting State Machine")
+        return False
+
+
+def delete_step_functions(
+        client: BaseClient,
+        state_machine_arns: List[str],
+        max_workers: int = 16
+) -> Dict[str, bool]:
+    """
+    Delete several step functions concurrently.
+
+    Boto3 clients are thread-safe, so the deletes share one client.
+
+    Args:
+        client: Boto3 step functions client
+        state_machine_arns: ARNs of the state machines to delete
+        max_workers: Maximum number of deletes in flight
+
+    Returns:
+        Dict mapping each ARN to whether its deletion succeeded
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(delete_step_function, client, arn): arn
+            for arn in state_machine_arns
+        }
+        results = {}
+        for future in as_completed(futures):
+            arn = futures[future]
+            # One unexpected failure must not discard the other results
+            try:
+                results[arn] = future.result()
+            except Exception:
+                logger.exception("Error deleting State Machine %s", arn)
+                results[arn] = False
+        return results
+
+
+def create_step_functions(
+        client: BaseClient,
+        state_machine_names: List[str],
+        executor_role_arn: str,
+        max_workers: int = 16
+) -> Dict[str, Optional[str]]:
+    """
+    Create several Hello World step functions concurrently.
+
+    Args:
+        client: Boto3 step functions client
+        state_machine_names: Names for the new state machines
+        executor_role_arn: ARN of the role to execute the state machines
+        max_workers: Maximum number of creates in flight
+
+    Returns:
+        Dict mapping each name to the created ARN, or None on failure
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(create_step_function, client, name, executor_role_arn): name
+            for name in state_machine_names
+        }
+        results = {}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception:
+                logger.exception("Error creating State Machine %s", name)
+                results[name] = None
+        return results